@@ -5,59 +5,80 @@ example.py
 ----------
 Example usage of Vulnhalla - demonstrates a full pipeline run for multiple repositories.
 
-This example processes two repositories using the analyze_pipeline function,
-which handles:
-1) Fetching CodeQL databases
+This example processes two repositories using the pipeline steps:
+1) Fetching CodeQL databases (both repositories concurrently)
 2) Running CodeQL queries
 3) Analyzing results with LLM
 4) Opening the results UI (once at the end)
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add project root to Python path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.pipeline import analyze_pipeline
 from src.utils.logger import setup_logging, get_logger
 
 logger = get_logger(__name__)
 
+LANG = "c"
+
+# (repository, threads) pairs to analyze
+REPOS = [
+    ("videolan/vlc", 4),  # Lower threads to avoid GitHub rate limits
+    ("redis/redis", 16),
+]
+
 
 def main():
     """
     Run an end-to-end example of the Vulnhalla pipeline for multiple repositories.
 
-    This function processes two demo repositories using the analyze_pipeline function.
-    Each repository goes through the complete pipeline:
+    This function processes two demo repositories. Each repository goes through
+    the complete pipeline:
     - Fetch CodeQL databases
     - Run CodeQL queries
     - Classify findings using the configured LLM provider
     - Write results to the output directory
-    
+
+    Database downloads are independent and network-bound, so they run concurrently.
+    The remaining steps run one repository at a time: each CodeQL run already uses
+    all the threads it is given, and LLM results for the same issue type share
+    numbering in the output directory.
+
     After processing both repositories, the results UI is opened once.
     """
     # Initialize logging
     setup_logging()
+
+    # Imported here so loading this module does not pull in the CodeQL, LLM and UI stacks
+    from src.pipeline import (
+        validate_configuration,
+        step1_fetch_codeql_dbs,
+        step2_run_codeql_queries,
+        step3_classify_results_with_llm,
+        step4_open_ui,
+    )
+
     logger.info("Starting Vulnhalla pipeline example... This may take a few minutes.")
     logger.info("")
-    
-    # Process videolan/vlc
-    analyze_pipeline(
-        repo="videolan/vlc",
-        lang="c",
-        threads=4,  # Lower threads to avoid GitHub rate limits
-        open_ui=False  # Open UI once at the end
-    )
-    
-    # Process redis/redis
-    analyze_pipeline(
-        repo="redis/redis",
-        lang="c",
-        threads=16,
-    )
+
+    validate_configuration()
+
+    with ThreadPoolExecutor(max_workers=len(REPOS)) as executor:
+        dbs_dirs = list(executor.map(
+            lambda repo_threads: step1_fetch_codeql_dbs(LANG, repo_threads[1], repo_threads[0]),
+            REPOS
+        ))
+
+    for (_, threads), dbs_dir in zip(REPOS, dbs_dirs):
+        step2_run_codeql_queries(dbs_dir, LANG, threads)
+        step3_classify_results_with_llm(dbs_dir, LANG)
+
+    step4_open_ui()
 
 if __name__ == "__main__":
     main()
@@ -6,52 +6,362 @@ Macros.csv, GlobalVars.csv, Classes.csv) and extract code snippets from
 the source archive.
 """
 
+import csv
+import io
+import os
+import sys
+import threading
+import zipfile
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 
 from src.utils.exceptions import CodeQLError
-from src.utils.common_functions import read_file_lines_from_zip
-from src.utils.csv_parser import parse_csv_row
+
+# Larger source files are streamed from src.zip instead of being cached whole
+_MAX_CACHED_SRC_BYTES = 1 << 20
+# Tool CSVs indexed per database (FunctionTree, Macros, GlobalVars, Classes)
+_CSV_TABLES_PER_DB = 4
+# Indexed CSV tables kept per CodeQLDBLookup
+_MAX_CACHED_CSV_TABLES = 4 * _CSV_TABLES_PER_DB
+
+# Generated macro bodies can exceed the csv module's default 128 KiB field limit;
+# 2**31 - 1 is the largest value accepted where a C long is 32 bits
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+
+def _normalize(value: str) -> str:
+    """
+    Strip surrounding whitespace and CSV quotes from a field value.
+
+    Rows parsed elsewhere with the regex splitter (e.g. by IssueAnalyzer) keep
+    their quotes, so values taken from caller-supplied dicts go through here.
+    """
+    return value.strip().strip("\"")
+
+
+class _LineIntervals(NamedTuple):
+    """
+    Line ranges of the rows belonging to one source file, sorted by start line.
+
+    max_ends[i] is the largest end line among the first i + 1 ranges, which bounds
+    how far back a lookup has to walk to find every range covering a line.
+    """
+    starts: array
+    ends: array
+    max_ends: array
+    offsets: array
+
+
+def _earliest(offsets: Iterable[Optional[int]]) -> Optional[int]:
+    """Return the smallest row offset, ignoring missing ones."""
+    return min((offset for offset in offsets if offset is not None), default=None)
+
+
+@dataclass(slots=True)
+class _CsvTable:
+    """
+    Parsed CSV file stored column-wise, plus the lookup structures built over it.
+
+    Rows are addressed by offset; indexes and intervals hold offsets rather than
+    row dicts, and a dict is only built by `row_view()` for rows handed back to
+    callers. Sorted index values for prefix search are built on first use.
+    """
+    keys: Tuple[str, ...]
+    columns: Dict[str, List[str]]
+    indexes: Dict[str, Dict[str, List[int]]]
+    intervals: Dict[str, _LineIntervals]
+    sorted_values: Dict[str, List[str]] = field(default_factory=dict)
+
+    def row_view(self, offset: int) -> Dict[str, str]:
+        """Materialize the row at offset as a {field: value} dict."""
+        return {key: self.columns[key][offset] for key in self.keys}
+
+    def first_partial_match(self, needle: str, *index_keys: str) -> Optional[int]:
+        """
+        Return the offset of the earliest row whose indexed value starts with needle,
+        or, failing that, the earliest row whose indexed value contains it.
+
+        Prefix matches are found by binary search over the sorted index values;
+        only a query without any prefix match scans the values for substrings.
+        """
+        offset = _earliest(self._first_prefix_match(key, needle) for key in index_keys)
+        if offset is None:
+            offset = _earliest(self._first_substring_match(key, needle) for key in index_keys)
+        return offset
+
+    def _first_prefix_match(self, key: str, prefix: str) -> Optional[int]:
+        index = self.indexes[key]
+        values = self.sorted_values.get(key)
+        if values is None:
+            values = self.sorted_values[key] = sorted(index)
+        lo = bisect_left(values, prefix)
+        hi = bisect_left(values, prefix + chr(sys.maxunicode), lo)
+        return min((index[value][0] for value in values[lo:hi]), default=None)
+
+    def _first_substring_match(self, key: str, needle: str) -> Optional[int]:
+        # Index keys are kept in order of first appearance, so the first
+        # matching key also holds the earliest matching row
+        index = self.indexes[key]
+        return next((offsets[0] for value, offsets in index.items() if needle in value), None)
+
+
+def _index_csv(
+    file_path: str,
+    keys: Tuple[str, ...],
+    index_keys: Tuple[str, ...],
+    interval_key: Optional[str] = None
+) -> _CsvTable:
+    """
+    Parse a CSV file in a single pass and index its rows by the given fields.
+
+    Parsing uses the C-accelerated csv module, which also unquotes values and
+    handles quoted fields spanning several lines. Values are stripped once
+    here, and indexed values are interned since they repeat across rows (the
+    same file or caller id appears many times). Rows with missing fields are
+    padded with empty strings, which are left out of the indexes.
+
+    Raises:
+        OSError: If the file cannot be read.
+        UnicodeDecodeError: If the file is not valid UTF-8.
+        csv.Error: If the file is not valid CSV.
+    """
+    columns: Dict[str, List[str]] = {key: [] for key in keys}
+    indexes: Dict[str, Dict[str, List[int]]] = {key: {} for key in index_keys}
+    ranges: Dict[str, List[Tuple[int, int, int]]] = {}
+    interned_keys = set(index_keys)
+    if interval_key:
+        interned_keys.add(interval_key)
+
+    offset = 0
+    with Path(file_path).open("r", encoding="utf-8", newline="") as f:
+        for fields in csv.reader(f):
+            if not fields:
+                continue
+            fields += [""] * (len(keys) - len(fields))
+            for key, value in zip(keys, fields):
+                value = value.strip()
+                if key in interned_keys:
+                    value = sys.intern(value)
+                columns[key].append(value)
+            for key in index_keys:
+                value = columns[key][offset]
+                if value:
+                    indexes[key].setdefault(value, []).append(offset)
+            if interval_key:
+                try:
+                    start = int(columns["start_line"][offset])
+                    end = int(columns["end_line"][offset])
+                    ranges.setdefault(columns[interval_key][offset], []).append((start, end, offset))
+                except ValueError:
+                    pass  # Header or malformed row
+            offset += 1
+
+    intervals: Dict[str, _LineIntervals] = {}
+    for group, group_ranges in ranges.items():
+        group_ranges.sort(key=lambda r: r[0])
+        max_ends = array("i")
+        for _, end, _ in group_ranges:
+            max_ends.append(max(end, max_ends[-1]) if max_ends else end)
+        intervals[group] = _LineIntervals(
+            array("i", (r[0] for r in group_ranges)),
+            array("i", (r[1] for r in group_ranges)),
+            max_ends,
+            array("i", (r[2] for r in group_ranges)),
+        )
+    return _CsvTable(keys, columns, indexes, intervals)
+
+
+def _innermost_interval(intervals: _LineIntervals, line: int) -> Optional[Tuple[int, int]]:
+    """
+    Find the smallest range covering line, using binary search on start lines.
+
+    Returns:
+        Optional[Tuple[int, int]]: (range size, row offset) of the best match, or None.
+    """
+    best = None
+    i = bisect_right(intervals.starts, line) - 1
+    while i >= 0 and intervals.max_ends[i] >= line:
+        if intervals.ends[i] >= line:
+            candidate = (intervals.ends[i] - intervals.starts[i], intervals.offsets[i])
+            if best is None or candidate < best:
+                best = candidate
+        i -= 1
+    return best
 
 
 class CodeQLDBLookup:
     """
     Encapsulates CodeQL database lookup operations for functions, macros,
     global variables, classes, and caller relationships.
+
+    Source archives (src.zip) stay open between lookups; call `close()` once
+    the instance is no longer needed.
     """
 
-    def _iter_csv_lines(
+    def __init__(self) -> None:
+        """
+        Initialize the lookup with empty CSV and source archive caches.
+        """
+        # (path, keys, index_keys, interval_key) -> (mtime_ns, size, table), least recently used first
+        self._csv_cache: "OrderedDict[Tuple[Any, ...], Tuple[int, int, _CsvTable]]" = OrderedDict()
+        self._csv_cache_lock = threading.Lock()
+        self._zip_cache: Dict[str, zipfile.ZipFile] = {}
+        self._read_src_file = lru_cache(maxsize=256)(self._read_src_file_uncached)
+
+
+    def close(self) -> None:
+        """
+        Close all cached source archives and drop cached file contents and CSV tables.
+        """
+        self._csv_cache.clear()
+        self._read_src_file.cache_clear()
+        for zip_ref in self._zip_cache.values():
+            zip_ref.close()
+        self._zip_cache.clear()
+
+
+    def _src_zip(self, db_path: str) -> zipfile.ZipFile:
+        """
+        Return the open src.zip of a database, opening it on first use.
+
+        Args:
+            db_path (str): Path to the CodeQL database directory.
+
+        Returns:
+            zipfile.ZipFile: The cached archive handle.
+
+        Raises:
+            zipfile.BadZipFile: If the archive is invalid.
+            OSError: If the archive cannot be opened.
+        """
+        zip_ref = self._zip_cache.get(db_path)
+        if zip_ref is None:
+            zip_ref = self._zip_cache[db_path] = zipfile.ZipFile(Path(db_path) / "src.zip", "r")
+        return zip_ref
+
+
+    def _read_src_file_uncached(self, db_path: str, file_path: str) -> str:
+        """
+        Read a whole source file from a database's src.zip.
+
+        Args:
+            db_path (str): Path to the CodeQL database directory.
+            file_path (str): The internal path within src.zip to the file.
+
+        Returns:
+            str: The file contents decoded as UTF-8 (undecodable bytes replaced).
+
+        Raises:
+            zipfile.BadZipFile: If the archive is invalid.
+            KeyError: If file_path is not in the archive.
+            OSError: If the archive cannot be read.
+        """
+        return self._src_zip(db_path).read(file_path).decode("utf-8", "replace")
+
+
+    def _read_src_lines(self, db_path: str, file_path: str, start_line: int, end_line: int) -> List[str]:
+        """
+        Read lines start_line..end_line (inclusive, 1-indexed) of a source file in src.zip.
+
+        Files up to _MAX_CACHED_SRC_BYTES are read whole and cached; larger ones are
+        decompressed only up to end_line.
+
+        Args:
+            db_path (str): Path to the CodeQL database directory.
+            file_path (str): The internal path within src.zip to the file.
+            start_line (int): First line to return.
+            end_line (int): Last line to return.
+
+        Returns:
+            List[str]: The requested lines without their trailing newline.
+
+        Raises:
+            CodeQLError: If ZIP file cannot be read or file not found in archive.
+        """
+        zip_path = str(Path(db_path) / "src.zip")
+        try:
+            zip_ref = self._src_zip(db_path)
+            info = zip_ref.getinfo(file_path)
+            if info.file_size <= _MAX_CACHED_SRC_BYTES:
+                # Stop splitting after end_line; the unsplit tail is sliced off
+                code_file = self._read_src_file(db_path, file_path)
+                return code_file.split("\n", end_line)[start_line - 1:end_line]
+
+            with io.TextIOWrapper(zip_ref.open(info), "utf-8", errors="replace", newline="\n") as text:
+                return [
+                    line[:-1] if line.endswith("\n") else line
+                    for line in islice(text, start_line - 1, end_line)
+                ]
+        except zipfile.BadZipFile as e:
+            raise CodeQLError(f"Invalid or corrupted ZIP file: {zip_path}") from e
+        except KeyError as e:
+            raise CodeQLError(f"File '{file_path}' not found in ZIP archive: {zip_path}") from e
+        except PermissionError as e:
+            raise CodeQLError(f"Permission denied reading ZIP file: {zip_path}") from e
+        except OSError as e:
+            raise CodeQLError(f"OS error while reading ZIP file: {zip_path}") from e
+
+
+    def _load_csv(
         self,
         file_path: Union[str, Path],
-        file_type_name: str
-    ):
+        keys: List[str],
+        index_keys: List[str],
+        file_type_name: str,
+        interval_key: Optional[str] = None
+    ) -> _CsvTable:
         """
-        Generator that yields lines from a CSV file, handling file I/O errors.
+        Load a CSV file once and return its rows together with lookup indexes.
 
-        This helper centralizes CSV file opening, line iteration, and error handling.
-        Each method can iterate over the yielded lines and apply method-specific logic.
+        Results are memoized per instance together with the file's modification
+        time and size, so repeated lookups against the same CodeQL database are
+        served from memory while a regenerated CSV is re-indexed automatically.
+        At most _MAX_CACHED_CSV_TABLES tables are kept, least recently used first
+        out.
 
         Args:
             file_path: Path to the CSV file to read.
+            keys: Field names to map each row's values to.
+            index_keys: Fields to build a value -> row offsets index for.
             file_type_name: Descriptive name for the file type (e.g., "Function tree file",
                            "Macros CSV", "GlobalVars CSV") for error messages.
+            interval_key: Optional field to group start_line/end_line ranges by.
 
-        Yields:
-            str: Each line from the CSV file (including newline characters).
+        Returns:
+            _CsvTable:
+                - columns: For each key, the values of all rows, in file order.
+                - indexes: For each index key, a mapping of the field value to the
+                  offsets (in file order) of the rows holding it.
+                - intervals: For each interval_key value, its rows' sorted line ranges.
 
         Raises:
             CodeQLError: If file cannot be read (not found, permission denied, etc.).
         """
+        cache_key = (str(file_path), tuple(keys), tuple(index_keys), interval_key)
         try:
-            with Path(file_path).open("r", encoding="utf-8") as f:
-                while True:
-                    line = f.readline()
-                    if not line:
-                        break
-                    yield line
-        except (FileNotFoundError, PermissionError, OSError) as e:
+            stat = os.stat(file_path)
+            with self._csv_cache_lock:
+                cached = self._csv_cache.get(cache_key)
+                if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                    self._csv_cache.move_to_end(cache_key)
+                    return cached[2]
+            table = _index_csv(str(file_path), tuple(keys), tuple(index_keys), interval_key)
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
             raise self._convert_csv_file_error(e, file_path, file_type_name) from e
 
+        with self._csv_cache_lock:
+            self._csv_cache[cache_key] = (stat.st_mtime_ns, stat.st_size, table)
+            self._csv_cache.move_to_end(cache_key)
+            while len(self._csv_cache) > _MAX_CACHED_CSV_TABLES:
+                self._csv_cache.popitem(last=False)
+        return table
+
 
     @staticmethod
     def _convert_csv_file_error(
@@ -60,10 +370,11 @@ class CodeQLDBLookup:
         file_type_name: str
     ) -> CodeQLError:
         """
-        Convert file I/O exceptions to CodeQLError with consistent messaging.
+        Convert file I/O and parsing exceptions to CodeQLError with consistent messaging.
 
         Args:
-            error: The original exception (FileNotFoundError, PermissionError, or OSError).
+            error: The original exception (FileNotFoundError, PermissionError, OSError,
+                UnicodeDecodeError, or csv.Error).
             file_path: Path to the CSV file that caused the error.
             file_type_name: Descriptive name for the file type (e.g., "Function tree file",
                            "Macros CSV", "GlobalVars CSV") for error messages.
@@ -78,11 +389,125 @@ class CodeQLDBLookup:
             return CodeQLError(f"Permission denied reading {file_type_name}: {file_path_str}")
         elif isinstance(error, OSError):
             return CodeQLError(f"OS error while reading {file_type_name}: {file_path_str}")
+        elif isinstance(error, UnicodeDecodeError):
+            return CodeQLError(f"Failed to decode {file_type_name} as UTF-8: {file_path_str}")
+        elif isinstance(error, csv.Error):
+            return CodeQLError(f"Malformed {file_type_name}: {file_path_str}: {error}")
         else:
             # Fallback for unexpected exception types
             return CodeQLError(f"Error reading {file_type_name}: {file_path_str}")
 
 
+    def _load_function_tree(
+        self,
+        function_tree_file: Union[str, Path]
+    ) -> _CsvTable:
+        """
+        Load FunctionTree.csv indexed by function_id and caller_id, with line ranges
+        grouped by file.
+
+        Args:
+            function_tree_file: Path to the FunctionTree.csv file.
+
+        Returns:
+            _CsvTable: Rows and lookup structures, as returned by `_load_csv`.
+
+        Raises:
+            CodeQLError: If function tree file cannot be read (not found, permission denied, etc.).
+        """
+        keys = ["function_name", "file", "start_line", "function_id", "end_line", "caller_id"]
+        return self._load_csv(
+            function_tree_file,
+            keys,
+            ["function_id", "caller_id"],
+            "Function tree file",
+            interval_key="file"
+        )
+
+
+    def _load_macros(self, curr_db: Union[str, Path]) -> _CsvTable:
+        """
+        Load a database's Macros.csv indexed by macro_name.
+
+        Args:
+            curr_db: Path to the CodeQL database folder.
+
+        Returns:
+            _CsvTable: Rows and lookup structures, as returned by `_load_csv`.
+
+        Raises:
+            CodeQLError: If Macros CSV file cannot be read (not found, permission denied, etc.).
+        """
+        keys = ["macro_name", "body"]
+        return self._load_csv(Path(curr_db) / "Macros.csv", keys, ["macro_name"], "Macros CSV")
+
+
+    def _load_global_vars(self, curr_db: Union[str, Path]) -> _CsvTable:
+        """
+        Load a database's GlobalVars.csv indexed by global_var_name.
+
+        Args:
+            curr_db: Path to the CodeQL database folder.
+
+        Returns:
+            _CsvTable: Rows and lookup structures, as returned by `_load_csv`.
+
+        Raises:
+            CodeQLError: If GlobalVars CSV file cannot be read (not found, permission denied, etc.).
+        """
+        keys = ["global_var_name", "file", "start_line", "end_line"]
+        return self._load_csv(
+            Path(curr_db) / "GlobalVars.csv", keys, ["global_var_name"], "GlobalVars CSV"
+        )
+
+
+    def _load_classes(self, curr_db: Union[str, Path]) -> _CsvTable:
+        """
+        Load a database's Classes.csv indexed by class_name and simple_name.
+
+        Args:
+            curr_db: Path to the CodeQL database folder.
+
+        Returns:
+            _CsvTable: Rows and lookup structures, as returned by `_load_csv`.
+
+        Raises:
+            CodeQLError: If Classes CSV file cannot be read (not found, permission denied, etc.).
+        """
+        keys = ["type", "class_name", "file", "start_line", "end_line", "simple_name"]
+        return self._load_csv(
+            Path(curr_db) / "Classes.csv", keys, ["class_name", "simple_name"], "Classes CSV"
+        )
+
+
+    @property
+    def cached_db_capacity(self) -> int:
+        """
+        Number of databases whose tool CSVs fit in the table cache at the same time.
+        """
+        return max(1, _MAX_CACHED_CSV_TABLES // _CSV_TABLES_PER_DB)
+
+
+    def prewarm(self, curr_db: str) -> None:
+        """
+        Index all four tool CSVs of a database ahead of the lookups.
+
+        Parsing holds the GIL, so the files are loaded one after another; callers
+        overlap this with other work by running it in a background thread (see
+        IssueAnalyzer.run). FunctionTree.csv, needed for every issue, comes first.
+
+        Args:
+            curr_db (str): Path to the CodeQL database folder.
+
+        Raises:
+            CodeQLError: If one of the CSV files cannot be read (not found, permission denied, etc.).
+        """
+        self._load_function_tree(Path(curr_db) / "FunctionTree.csv")
+        self._load_macros(curr_db)
+        self._load_global_vars(curr_db)
+        self._load_classes(curr_db)
+
+
     def get_function_by_line(
         self,
         function_tree_file: str,
@@ -91,7 +516,8 @@ class CodeQLDBLookup:
     ) -> Optional[Dict[str, str]]:
         """
         Retrieve the function dictionary from a CSV (FunctionTree.csv) that matches
-        the specified file and line coverage.
+        the specified file and line coverage. When functions are nested, the
+        innermost (smallest) one is returned.
 
         Args:
             function_tree_file (str): Path to the FunctionTree.csv file.
@@ -104,34 +530,31 @@ class CodeQLDBLookup:
         Raises:
             CodeQLError: If function tree file cannot be read (not found, permission denied, etc.).
         """
-        keys = ["function_name", "file", "start_line", "function_id", "end_line", "caller_id"]
-        for function in self._iter_csv_lines(function_tree_file, "Function tree file"):
-            if file in function:
-                row_dict = parse_csv_row(function, keys)
-                if row_dict and row_dict["start_line"] and row_dict["end_line"]:
-                    start = int(row_dict["start_line"])
-                    end = int(row_dict["end_line"])
-                    if start <= line <= end:
-                        return row_dict
-        return None
+        function_tree = self._load_function_tree(function_tree_file)
+
+        best = None
+        for indexed_file, intervals in function_tree.intervals.items():
+            if file in indexed_file:
+                candidate = _innermost_interval(intervals, line)
+                if candidate is not None and (best is None or candidate < best):
+                    best = candidate
+        return function_tree.row_view(best[1]) if best is not None else None
 
 
     def get_function_by_name(
             self,
             function_tree_file: str,
             function_name: str,
-            all_function: List[Dict[str, Any]],
-            less_strict: bool = False
+            all_function: List[Dict[str, Any]]
         ) -> Tuple[Union[str, Dict[str, str]], Optional[Dict[str, str]]]:
             """
             Retrieve a function by searching function_name in FunctionTree.csv.
-            If not found, tries partial match if less_strict is True.
+            If no exact match is found, falls back to the first partial match.
 
             Args:
                 function_tree_file (str): Path to FunctionTree.csv.
                 function_name (str): Desired function name (e.g., 'MyClass::MyFunc').
                 all_function (List[Dict[str, Any]]): A list of known function dictionaries.
-                less_strict (bool, optional): If True, use partial matching. Defaults to False.
 
             Returns:
                 Tuple[Union[str, Dict[str, str]], Optional[Dict[str, str]]]:
@@ -141,53 +564,55 @@ class CodeQLDBLookup:
             Raises:
                 CodeQLError: If function tree file cannot be read (not found, permission denied, etc.).
             """
-            keys = ["function_name", "file", "start_line", "function_id", "end_line", "caller_id"]
-            function_name_only = function_name.split("::")[-1]
+            function_tree = self._load_function_tree(function_tree_file)
+            by_id = function_tree.indexes["function_id"]
+            by_caller = function_tree.indexes["caller_id"]
+            names = function_tree.columns["function_name"]
+            function_name_only = function_name.rpartition("::")[2] or function_name
+            partial = None
+            seen_ids = set()
 
             for current_function in all_function:
-                try:
-                    with Path(function_tree_file).open("r", encoding="utf-8") as f:
-                        while True:
-                            row = f.readline()
-                            if not row:
-                                break
-                            if current_function["function_id"] in row:
-                                row_dict = parse_csv_row(row, keys)
-                                if not row_dict:
-                                    continue
-
-                                candidate_name = row_dict["function_name"].replace("\"", "")
-                                if (candidate_name == function_name_only
-                                        or (less_strict and function_name_only in candidate_name)):
-                                    return row_dict, current_function
-                except (FileNotFoundError, PermissionError, OSError) as e:
-                    raise self._convert_csv_file_error(e, function_tree_file, "Function tree file") from e
-
-            # Try partial matching if less_strict is False
-            if not less_strict:
-                return self.get_function_by_name(function_tree_file, function_name, all_function, True)
-            else:
-                err = (
-                    f"Function '{function_name}' not found. Make sure you're using "
-                    "the correct tool and args."
-                )
-                return err, None
+                # Known functions are appended as the conversation goes on, often repeatedly;
+                # a repeated id yields the same rows, so only its first occurrence is checked
+                function_id = _normalize(current_function["function_id"])
+                if function_id in seen_ids:
+                    continue
+                seen_ids.add(function_id)
+
+                # Rows referencing a known function: the function itself and its callees
+                offsets = sorted(by_id.get(function_id, []) + by_caller.get(function_id, []))
+                for offset in offsets:
+                    candidate_name = names[offset]
+                    if candidate_name == function_name_only:
+                        return function_tree.row_view(offset), current_function
+                    if partial is None and function_name_only in candidate_name:
+                        partial = (offset, current_function)
+
+            if partial is not None:
+                offset, parent_function = partial
+                return function_tree.row_view(offset), parent_function
+
+            err = (
+                f"Function '{function_name}' not found. Make sure you're using "
+                "the correct tool and args."
+            )
+            return err, None
 
 
     def get_macro(
         self,
         curr_db: str,
-        macro_name: str,
-        less_strict: bool = False
+        macro_name: str
     ) -> Union[str, Dict[str, str]]:
         """
         Return macro info from Macros.csv for the given macro_name.
-        If not found, tries partial match if less_strict is True.
+        If no exact match is found, falls back to the first partial match,
+        preferring names that start with macro_name.
 
         Args:
             curr_db (str): Path to the current CodeQL database folder.
             macro_name (str): Macro name to search for.
-            less_strict (bool, optional): If True, use partial matching.
 
         Returns:
             Union[str, Dict[str, str]]:
@@ -197,43 +622,62 @@ class CodeQLDBLookup:
         Raises:
             CodeQLError: If Macros CSV file cannot be read (not found, permission denied, etc.).
         """
-        macro_file = Path(curr_db) / "Macros.csv"
-        keys = ["macro_name", "body"]
+        return self.get_macros_batch(curr_db, [macro_name])[macro_name]
 
-        for macro in self._iter_csv_lines(macro_file, "Macros CSV"):
-            if macro_name in macro:
-                row_dict = parse_csv_row(macro, keys)
-                if not row_dict:
-                    continue
 
-                actual_name = row_dict["macro_name"].replace("\"", "")
-                if (actual_name == macro_name
-                        or (less_strict and macro_name in actual_name)):
-                    return row_dict
+    def get_macros_batch(
+        self,
+        curr_db: str,
+        macro_names: Iterable[str]
+    ) -> Dict[str, Union[str, Dict[str, str]]]:
+        """
+        Resolve several macro names against Macros.csv, loading the table once.
+        Each name is resolved exactly as get_macro() would resolve it.
 
-        if not less_strict:
-            return self.get_macro(curr_db, macro_name, True)
-        else:
-            return (
-                f"Macro '{macro_name}' not found. Make sure you're using the correct tool "
-                "with correct args."
-            )
+        Args:
+            curr_db (str): Path to the current CodeQL database folder.
+            macro_names (Iterable[str]): Macro names to search for.
+
+        Returns:
+            Dict[str, Union[str, Dict[str, str]]]: Maps each requested name to its
+                macro dict, or to an error message string if it was not found.
+        
+        Raises:
+            CodeQLError: If Macros CSV file cannot be read (not found, permission denied, etc.).
+        """
+        macros = self._load_macros(curr_db)
+        by_name = macros.indexes["macro_name"]
+
+        results: Dict[str, Union[str, Dict[str, str]]] = {}
+        for macro_name in macro_names:
+            if macro_name in results:
+                continue
+            offset = by_name[macro_name][0] if macro_name in by_name else None
+            if offset is None:
+                offset = macros.first_partial_match(macro_name, "macro_name")
+            if offset is not None:
+                results[macro_name] = macros.row_view(offset)
+            else:
+                results[macro_name] = (
+                    f"Macro '{macro_name}' not found. Make sure you're using the correct tool "
+                    "with correct args."
+                )
+        return results
 
 
     def get_global_var(
         self,
         curr_db: str,
-        global_var_name: str,
-        less_strict: bool = False
+        global_var_name: str
     ) -> Union[str, Dict[str, str]]:
         """
         Return a global variable from GlobalVars.csv matching global_var_name.
-        If not found, tries partial match if less_strict is True.
+        If no exact match is found, falls back to the first partial match,
+        preferring names that start with global_var_name.
 
         Args:
             curr_db (str): Path to current CodeQL database folder.
             global_var_name (str): The name of the global variable to find.
-            less_strict (bool, optional): If True, use partial matching.
 
         Returns:
             Union[str, Dict[str, str]]:
@@ -243,44 +687,35 @@ class CodeQLDBLookup:
         Raises:
             CodeQLError: If GlobalVars CSV file cannot be read (not found, permission denied, etc.).
         """
-        global_var_file = Path(curr_db) / "GlobalVars.csv"
-        keys = ["global_var_name", "file", "start_line", "end_line"]
-        var_name_only = global_var_name.split("::")[-1]
-
-        for line in self._iter_csv_lines(global_var_file, "GlobalVars CSV"):
-            if var_name_only in line:
-                data_dict = parse_csv_row(line, keys)
-                if not data_dict:
-                    continue
+        var_name_only = global_var_name.rpartition("::")[2] or global_var_name
+        global_vars = self._load_global_vars(curr_db)
+        by_name = global_vars.indexes["global_var_name"]
 
-                actual_name = data_dict["global_var_name"].replace("\"", "")
-                if (actual_name == var_name_only
-                        or (less_strict and var_name_only in actual_name)):
-                    return data_dict
+        offset = by_name[var_name_only][0] if var_name_only in by_name else None
+        if offset is None:
+            offset = global_vars.first_partial_match(var_name_only, "global_var_name")
+        if offset is not None:
+            return global_vars.row_view(offset)
 
-        if not less_strict:
-            return self.get_global_var(curr_db, global_var_name, True)
-        else:
-            return (
-                f"Global var '{global_var_name}' not found. "
-                "Could it be a macro or should you use another tool?"
-            )
+        return (
+            f"Global var '{global_var_name}' not found. "
+            "Could it be a macro or should you use another tool?"
+        )
 
 
     def get_class(
         self,
         curr_db: str,
-        class_name: str,
-        less_strict: bool = False
+        class_name: str
     ) -> Union[str, Dict[str, str]]:
         """
         Return class info (type, class_name, file, start_line, end_line, simple_name)
-        from Classes.csv for class_name. If not found, tries partial match if less_strict is True.
+        from Classes.csv for class_name. If no exact match is found, falls back to
+        the first partial match, preferring names that start with class_name.
 
         Args:
             curr_db (str): Path to current CodeQL database folder.
             class_name (str): The name of the class/struct/union to find.
-            less_strict (bool, optional): If True, use partial matching.
 
         Returns:
             Union[str, Dict[str, str]]:
@@ -290,30 +725,20 @@ class CodeQLDBLookup:
         Raises:
             CodeQLError: If Classes CSV file cannot be read (not found, permission denied, etc.).
         """
-        classes_file = Path(curr_db) / "Classes.csv"
-        keys = ["type", "class_name", "file", "start_line", "end_line", "simple_name"]
-        class_name_only = class_name.split("::")[-1]
+        class_name_only = class_name.rpartition("::")[2] or class_name
+        classes = self._load_classes(curr_db)
+        by_class, by_simple = classes.indexes["class_name"], classes.indexes["simple_name"]
 
-        for row in self._iter_csv_lines(classes_file, "Classes CSV"):
-            if class_name_only in row:
-                row_dict = parse_csv_row(row, keys)
-                if not row_dict:
-                    continue
+        offset = _earliest(
+            index[class_name_only][0] if class_name_only in index else None
+            for index in (by_class, by_simple)
+        )
+        if offset is None:
+            offset = classes.first_partial_match(class_name_only, "class_name", "simple_name")
+        if offset is not None:
+            return classes.row_view(offset)
 
-                actual_class = row_dict["class_name"].replace("\"", "")
-                simple_class = row_dict["simple_name"].replace("\"", "")
-                if (
-                    actual_class == class_name_only
-                    or simple_class == class_name_only
-                    or (less_strict and class_name_only in actual_class)
-                    or (less_strict and class_name_only in simple_class)
-                ):
-                    return row_dict
-
-        if not less_strict:
-            return self.get_class(curr_db, class_name, True)
-        else:
-            return f"Class '{class_name}' not found. Could it be a Namespace?"
+        return f"Class '{class_name}' not found. Could it be a Namespace?"
 
 
     def get_caller_function(
@@ -336,21 +761,16 @@ class CodeQLDBLookup:
         Raises:
             CodeQLError: If function tree file cannot be read (not found, permission denied, etc.).
         """
-        keys = ["function_name", "file", "start_line", "function_id", "end_line", "caller_id"]
-        caller_id = current_function["caller_id"].replace("\"", "").strip()
+        function_tree = self._load_function_tree(function_tree_file)
+        caller_id = _normalize(current_function["caller_id"])
 
-        for line in self._iter_csv_lines(function_tree_file, "Function tree file"):
-            if caller_id in line:
-                data_dict = parse_csv_row(line, keys)
-                if not data_dict:
-                    continue
-                if data_dict["function_id"].replace("\"", "").strip() == caller_id:
-                    return data_dict
+        offsets = function_tree.indexes["function_id"].get(caller_id)
+        if offsets:
+            return function_tree.row_view(offsets[0])
 
         # Fallback if 'caller_id' is in format file:line
-        maybe_line = caller_id.split(":")
-        if len(maybe_line) == 2:
-            file_part, line_part = maybe_line
+        file_part, _, line_part = caller_id.rpartition(":")
+        if file_part and line_part.isdigit():
             function = self.get_function_by_line(function_tree_file, file_part[1:], int(line_part))
             if function:
                 return function
@@ -378,16 +798,16 @@ class CodeQLDBLookup:
                 - file_path (str): The file path (after .replace and [1:])
                 - start_line (int): Starting line number
                 - end_line (int): Ending line number
-                - all_lines (List[str]): Full file splitlines
+                - snippet_lines (List[str]): Lines start_line..end_line (inclusive) of the file
+
+        Raises:
+            CodeQLError: If ZIP file cannot be read or file not found in archive.
         """
-        src_zip = Path(db_path) / "src.zip"
         file_path = current_function["file"].replace("\"", "")[1:]
-        code_file = read_file_lines_from_zip(str(src_zip), file_path)
-        lines = code_file.split("\n")
-
         start_line = int(current_function["start_line"])
         end_line = int(current_function["end_line"])
-        return file_path, start_line, end_line, lines
+        snippet_lines = self._read_src_lines(db_path, file_path, start_line, end_line)
+        return file_path, start_line, end_line, snippet_lines
 
 
     @staticmethod
@@ -403,7 +823,6 @@ class CodeQLDBLookup:
         Returns:
             str: Formatted snippet with line numbers.
         """
-        snippet = "\n".join(
-            f"{start_line + i}: {text}" for i, text in enumerate(snippet_lines)
-        )
+        line_numbers = range(start_line, start_line + len(snippet_lines))
+        snippet = "\n".join([f"{n}: {text}" for n, text in zip(line_numbers, snippet_lines)])
         return f"file: {file_path}\n{snippet}"
@@ -7,19 +7,30 @@ By default, it compiles all .ql files under 'data/queries/<LANG>/tools' and
 'data/queries/<LANG>/issues', then runs them on each CodeQL database located
 in 'output/databases/<LANG>'.
 
+CodeQL processes are started per batch, not per query: one compile call for
+all uncompiled queries, then per database one 'database run-queries' call for
+the tool queries (plus one 'bqrs decode' per tool result) and one
+'database analyze' call for the issue queries.
+
 Example:
     python src/codeql/run_codeql_queries.py
 """
 
+import logging
+import os
+import shutil
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import suppress
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 # Make sure your common_functions module is in your PYTHONPATH or same folder
-from src.utils.common_functions import get_all_dbs
+from src.utils.common_functions import get_all_dbs, read_yml
 from src.utils.config import get_codeql_path
 from src.utils.logger import get_logger
-from src.utils.exceptions import CodeQLError, CodeQLConfigError, CodeQLExecutionError
+from src.utils.exceptions import CodeQLError, CodeQLConfigError, CodeQLExecutionError, VulnhallaError
 
 logger = get_logger(__name__)
 
@@ -27,104 +38,94 @@ logger = get_logger(__name__)
 # Default locations/values
 DEFAULT_CODEQL = get_codeql_path()
 DEFAULT_LANG = "c"  # Mapped to data/queries/cpp for some tasks
+# Keeps a single 'codeql query compile' command line well below OS limits
+_COMPILE_BATCH_SIZE = 200
+# 'codeql bqrs decode' processes started at once for one database
+_MAX_PARALLEL_DECODES = 4
+# How much of a failed command's stderr is kept in the raised error
+_STDERR_TAIL_CHARS = 2000
+# LLM credentials LLMAnalyzer.init_llm_client() puts into os.environ; CodeQL
+# never needs them, so they are not passed on to its processes
+_LLM_CREDENTIAL_ENV_SUFFIXES = ("_API_KEY",)
+_LLM_CREDENTIAL_ENV_KEYS = frozenset({"AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"})
+
+
+def _codeql_env() -> Dict[str, str]:
+    """
+    Build the environment for a CodeQL command from the current os.environ.
+
+    Returns:
+        Dict[str, str]: The process environment without LLM credentials.
+    """
+    return {
+        key: value for key, value in os.environ.items()
+        if key not in _LLM_CREDENTIAL_ENV_KEYS and not key.endswith(_LLM_CREDENTIAL_ENV_SUFFIXES)
+    }
 
 
-def pre_compile_ql(file_name: str, threads: int, codeql_bin: str) -> None:
+def _stderr_tail(error: subprocess.CalledProcessError) -> str:
     """
-    Pre-compile a single .ql file using CodeQL.
+    Format the end of a failed CodeQL command's stderr for an error message.
 
     Args:
-        file_name (str): The path to the .ql query file.
-        threads (int): Number of threads to use during compilation.
-        codeql_bin (str): Full path to the 'codeql' executable.
-    
-    Raises:
-        CodeQLConfigError: If CodeQL executable not found.
-        CodeQLExecutionError: If query compilation fails.
+        error (subprocess.CalledProcessError): The failure, with stderr captured as text.
+
+    Returns:
+        str: The last _STDERR_TAIL_CHARS characters of stderr on a new line, or ""
+            if it was empty.
     """
-    qlx_path = Path(str(file_name) + "x")
-    if not qlx_path.exists():
-        try:
-            subprocess.run(
-                [
-                    codeql_bin,
-                    "query",
-                    "compile",
-                    file_name,
-                    f'--threads={threads}',
-                    "--precompile"
-                ],
-                check=True,
-                text=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
-        except FileNotFoundError as e:
-            raise CodeQLConfigError(
-                f"CodeQL executable not found: {codeql_bin}. "
-                "Please check your CODEQL_PATH configuration."
-            ) from e
-        except subprocess.CalledProcessError as e:
-            raise CodeQLExecutionError(
-                f"Failed to compile query {file_name}: CodeQL returned exit code {e.returncode}"
-            ) from e
+    stderr = (error.stderr or "").strip()
+    return f"\n{stderr[-_STDERR_TAIL_CHARS:]}" if stderr else ""
 
 
-def compile_all_queries(queries_folder: str, threads: int, codeql_bin: str) -> None:
+def _resolve_codeql_bin(codeql_bin: str) -> str:
     """
-    Recursively pre-compile all .ql files in a folder.
+    Resolve the 'codeql' executable once, before any CodeQL command is started.
 
     Args:
-        queries_folder (str): Directory containing .ql files (and possibly subdirectories).
-        threads (int): Number of threads to use during compilation.
-        codeql_bin (str): Full path to the 'codeql' executable.
-    
+        codeql_bin (str): Executable name (looked up on PATH) or path.
+
+    Returns:
+        str: The path of the executable to run.
+
     Raises:
-        CodeQLConfigError: If CodeQL executable not found.
-        CodeQLExecutionError: If query compilation fails.
+        CodeQLConfigError: If no executable is found for codeql_bin.
     """
-    queries_folder_path = Path(queries_folder)
-    for file_path in queries_folder_path.rglob("*"):
-        if file_path.is_file() and file_path.suffix.lower() == ".ql":
-            pre_compile_ql(str(file_path), threads, codeql_bin)
+    resolved = shutil.which(codeql_bin)
+    if resolved is None and os.path.isfile(codeql_bin) and os.access(codeql_bin, os.X_OK):
+        resolved = codeql_bin
+    if resolved is None:
+        raise CodeQLConfigError(
+            f"CodeQL executable not found: {codeql_bin}. "
+            "Please check your CODEQL_PATH configuration."
+        )
+    return resolved
 
 
-def run_one_query(
-    query_file: str,
-    curr_db: str,
-    output_bqrs: str,
-    output_csv: str,
-    threads: int,
-    codeql_bin: str
-) -> None:
+def _run_codeql(args: List[str], codeql_bin: str, failure: str) -> None:
     """
-    Execute a single CodeQL query on a specific database and export the results.
+    Run a CodeQL CLI command, discarding its stdout and capturing its stderr.
 
     Args:
-        query_file (str): The path to the .ql file to run.
-        curr_db (str): The path to the CodeQL database on which to run queries.
-        output_bqrs (str): Where to write the intermediate BQRS output.
-        output_csv (str): Where to write the CSV representation of the results.
-        threads (int): Number of threads to use during query execution.
+        args (List[str]): Command-line arguments after the executable.
         codeql_bin (str): Full path to the 'codeql' executable.
-    
+        failure (str): Start of the error message if the command fails
+            (e.g. "Failed to compile query x.ql").
+
     Raises:
         CodeQLConfigError: If CodeQL executable not found.
-        CodeQLExecutionError: If query execution or BQRS decoding fails.
+        CodeQLExecutionError: If the command exits with a non-zero status.
     """
-    # Run the query
     try:
         subprocess.run(
-            [
-                codeql_bin, "query", "run", query_file,
-                f'--database={curr_db}',
-                f'--output={output_bqrs}',
-                f'--threads={threads}'
-            ],
+            [codeql_bin, *args],
             check=True,
-            text=True,
+            # stderr only feeds the error message; never fail on undecodable output
+            encoding="utf-8",
+            errors="replace",
             stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
+            stderr=subprocess.PIPE,
+            env=_codeql_env()
         )
     except FileNotFoundError as e:
         raise CodeQLConfigError(
@@ -133,28 +134,245 @@ def run_one_query(
         ) from e
     except subprocess.CalledProcessError as e:
         raise CodeQLExecutionError(
-            f"Failed to run query {query_file} on database {curr_db}: "
-            f"CodeQL returned exit code {e.returncode}"
+            f"{failure}: CodeQL returned exit code {e.returncode}{_stderr_tail(e)}"
         ) from e
 
-    # Decode BQRS to CSV
+
+def pre_compile_qls(file_names: List[str], threads: int, codeql_bin: str) -> None:
+    """
+    Pre-compile several .ql files, passing them to a single 'codeql query compile'
+    call (per batch of _COMPILE_BATCH_SIZE files) instead of starting CodeQL once
+    per query.
+
+    Args:
+        file_names (List[str]): Paths to the .ql query files.
+        threads (int): Number of threads to use during compilation.
+        codeql_bin (str): Full path to the 'codeql' executable.
+    
+    Raises:
+        CodeQLConfigError: If CodeQL executable not found.
+        CodeQLExecutionError: If query compilation fails.
+    """
+    for start in range(0, len(file_names), _COMPILE_BATCH_SIZE):
+        batch = file_names[start:start + _COMPILE_BATCH_SIZE]
+        queries = batch[0] if len(batch) == 1 else ", ".join(batch)
+        _run_codeql(
+            ["query", "compile", *batch, f'--threads={threads}', "--precompile"],
+            codeql_bin,
+            f"Failed to compile query {queries}"
+        )
+
+
+def _iter_ql_files(folder: Union[str, Path], recursive: bool = True) -> Iterator[str]:
+    """
+    Yield the paths of the .ql files in a folder.
+
+    Walks with os.scandir, whose entries carry the file type from the directory
+    listing, so only candidate .ql files (and symlinks) cost an extra stat.
+
+    Args:
+        folder (Union[str, Path]): Directory to search. A missing folder yields nothing.
+        recursive (bool, optional): Whether to descend into subdirectories. Defaults to True.
+
+    Yields:
+        str: Path of each .ql file found.
+    """
+    if not os.path.isdir(folder):
+        return
+    pending = [os.fspath(folder)]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(entry.path)
+                elif entry.name.endswith(".ql") and entry.is_file():
+                    yield entry.path
+
+
+def _find_uncompiled_queries(queries_folder: str) -> List[str]:
+    """
+    Recursively find the .ql files in a folder that have no precompiled .qlx yet.
+
+    Args:
+        queries_folder (str): Directory containing .ql files (and possibly subdirectories).
+
+    Returns:
+        List[str]: Paths of the .ql files that still need compiling.
+    """
+    return [
+        file_path
+        for file_path in _iter_ql_files(queries_folder)
+        if not os.path.exists(file_path + "x")
+    ]
+
+
+def _disk_cache_args(max_disk_cache_mb: Optional[int]) -> List[str]:
+    """
+    Build the evaluator options that keep a database's disk cache between runs.
+
+    CodeQL otherwise trims the cache under <db>/db-<lang>/default/cache after each
+    evaluation, so re-running queries on the same database starts cold.
+
+    Args:
+        max_disk_cache_mb (Optional[int]): Upper bound for the disk cache in MB,
+            or None to use CodeQL's default.
+
+    Returns:
+        List[str]: Arguments for 'codeql database run-queries' / 'codeql database analyze'.
+    """
+    args = ["--save-cache", "--keep-full-cache"]
+    if max_disk_cache_mb is not None:
+        args.append(f"--max-disk-cache={max_disk_cache_mb}")
+    return args
+
+
+def _ram_args(ram_mb: Optional[int]) -> List[str]:
+    """
+    Build the evaluator option that caps its memory use.
+
+    Args:
+        ram_mb (Optional[int]): Memory budget in MB, or None to let CodeQL size it
+            from the host's total memory.
+
+    Returns:
+        List[str]: Arguments for 'codeql database run-queries' / 'codeql database analyze'.
+    """
+    return [f"--ram={ram_mb}"] if ram_mb is not None else []
+
+
+def _host_memory_mb() -> Optional[int]:
+    """
+    Return the host's physical memory in MB, or None if it cannot be determined.
+    """
     try:
-        subprocess.run(
-            [
-                codeql_bin, "bqrs", "decode", output_bqrs,
-                '--format=csv', f'--output={output_csv}'
-            ],
-            check=True,
-            text=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        # os.sysconf does not exist on Windows
+        return None
+
+
+def decode_bqrs(
+    output_bqrs: Union[str, Path],
+    output_csv: Union[str, Path],
+    codeql_bin: str
+) -> None:
+    """
+    Export a BQRS result file as CSV.
+
+    The CSV is written next to output_csv first and moved into place once
+    decoding succeeds, so an interrupted decode never leaves a truncated CSV
+    that would later pass as current.
+
+    Args:
+        output_bqrs (Union[str, Path]): The BQRS file to decode.
+        output_csv (Union[str, Path]): Where to write the CSV representation of the results.
+        codeql_bin (str): Full path to the 'codeql' executable.
+
+    Raises:
+        CodeQLConfigError: If CodeQL executable not found.
+        CodeQLExecutionError: If BQRS decoding fails.
+        CodeQLError: If the decoded CSV cannot be moved into place.
+    """
+    partial_csv = f"{output_csv}.partial"
+    try:
+        _run_codeql(
+            ["bqrs", "decode", str(output_bqrs), '--format=csv', f'--output={partial_csv}'],
+            codeql_bin,
+            f"Failed to decode BQRS file {output_bqrs} to CSV"
         )
-    except subprocess.CalledProcessError as e:
-        raise CodeQLExecutionError(
-            f"Failed to decode BQRS file {output_bqrs} to CSV: "
-            f"CodeQL returned exit code {e.returncode}"
+        os.replace(partial_csv, output_csv)
+    except OSError as e:
+        raise CodeQLError(f"Failed to write decoded CSV {output_csv}") from e
+    finally:
+        # Left behind only if decoding or the move failed
+        with suppress(OSError):
+            os.remove(partial_csv)
+
+
+def _evaluate_tool_queries(
+    curr_db_path: Path,
+    tools_folder_path: Path,
+    query_files: List[Path],
+    threads: int,
+    codeql_bin: str,
+    max_disk_cache_mb: Optional[int],
+    ram_mb: Optional[int] = None
+) -> List[Tuple[Path, Path]]:
+    """
+    Evaluate tool queries in a single 'codeql database run-queries' call, so they
+    share one evaluator and its predicate cache.
+
+    The tool queries select plain tables rather than alerts, so 'database analyze'
+    cannot produce their CSVs. CodeQL stores the results of run-queries under
+    <curr_db>/results/<pack name>/<query path>.bqrs, to be decoded with decode_bqrs().
+    Only stale queries are passed in, so --rerun makes CodeQL evaluate them again
+    instead of reusing the BQRS files left by an earlier run.
+
+    Args:
+        curr_db_path (Path): The path to the CodeQL database.
+        tools_folder_path (Path): The tools query pack folder (holding qlpack.yml).
+        query_files (List[Path]): The .ql files in tools_folder_path to run.
+        threads (int): Number of threads to use during query execution.
+        codeql_bin (str): Full path to the 'codeql' executable.
+        max_disk_cache_mb (Optional[int]): Disk cache limit in MB, or None.
+        ram_mb (Optional[int], optional): Evaluator memory budget in MB. Defaults to
+            None (CodeQL sizes it from the host's memory).
+
+    Returns:
+        List[Tuple[Path, Path]]: For each query, its BQRS result file and the CSV
+            (<curr_db>/<query name>.csv) it should be decoded to.
+
+    Raises:
+        CodeQLConfigError: If CodeQL executable not found or the pack has no qlpack.yml name.
+        CodeQLExecutionError: If query execution fails.
+    """
+    try:
+        pack_name = read_yml(str(tools_folder_path / "qlpack.yml"))["name"]
+    except (VulnhallaError, KeyError, TypeError) as e:
+        raise CodeQLConfigError(
+            f"Cannot read the query pack name from {tools_folder_path / 'qlpack.yml'}"
         ) from e
 
+    _run_codeql(
+        [
+            "database", "run-queries", str(curr_db_path),
+            *[str(query_file) for query_file in query_files],
+            '--rerun',
+            f'--threads={threads}',
+            *_ram_args(ram_mb),
+            *_disk_cache_args(max_disk_cache_mb)
+        ],
+        codeql_bin,
+        f"Failed to run tool queries from {tools_folder_path} on database {curr_db_path}"
+    )
+
+    results_folder = curr_db_path / "results" / pack_name
+    return [
+        (
+            results_folder / query_file.relative_to(tools_folder_path).with_suffix(".bqrs"),
+            curr_db_path / f"{query_file.stem}.csv"
+        )
+        for query_file in query_files
+    ]
+
+
+def _tool_csv_is_current(query_file: Path, curr_db_path: Path) -> bool:
+    """
+    Check whether a tool query's CSV from an earlier run can be reused.
+
+    Args:
+        query_file (Path): The tool .ql file.
+        curr_db_path (Path): The path to the CodeQL database.
+
+    Returns:
+        bool: True if <curr_db>/<query name>.csv exists and is not older than the query.
+    """
+    try:
+        return (curr_db_path / f"{query_file.stem}.csv").stat().st_mtime >= query_file.stat().st_mtime
+    except OSError:
+        return False
+
 
 def run_queries_on_db(
     curr_db: str,
@@ -162,11 +380,14 @@ def run_queries_on_db(
     queries_folder: str,
     threads: int,
     codeql_bin: str,
-    timeout: int = 300
+    timeout: int = 300,
+    max_disk_cache_mb: Optional[int] = None,
+    ram_mb: Optional[int] = None
 ) -> None:
     """
-    Execute all tool queries in 'tools_folder' individually on a given database,
-    then run 'database analyze' with all queries in 'queries_folder'.
+    Execute all tool queries in 'tools_folder' on a given database (one CSV per
+    query), then run 'database analyze' with all queries in 'queries_folder'.
+    Tool queries whose CSV is already newer than the query are not run again.
 
     Args:
         curr_db (str): The path to the CodeQL database.
@@ -176,84 +397,185 @@ def run_queries_on_db(
         codeql_bin (str): Full path to the 'codeql' executable.
         timeout (int, optional): Timeout in seconds for the 'database analyze' command.
             Defaults to 300.
+        max_disk_cache_mb (Optional[int], optional): Disk cache limit in MB.
+            Defaults to None (CodeQL's default).
+        ram_mb (Optional[int], optional): Evaluator memory budget in MB. Defaults to
+            None (CodeQL sizes it from the host's memory).
     
     Raises:
         CodeQLConfigError: If CodeQL executable not found.
         CodeQLExecutionError: If query execution or database analysis fails.
     """
-    # 1) Run each .ql in tools_folder individually
-    tools_folder_path = Path(tools_folder)
-    if tools_folder_path.is_dir():
-        for file_path in tools_folder_path.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() == ".ql":
-                file_stem = file_path.stem
-                run_one_query(
-                    str(file_path),
-                    curr_db,
-                    str(Path(curr_db) / f"{file_stem}.bqrs"),
-                    str(Path(curr_db) / f"{file_stem}.csv"),
-                    threads,
-                    codeql_bin
+    curr_db_path = Path(curr_db)
+
+    # Decoding tool results does not touch the database, so it overlaps with step 2
+    with ThreadPoolExecutor(max_workers=_MAX_PARALLEL_DECODES) as decoder:
+        # 1) Run the .ql files in tools_folder together, exporting one CSV each
+        decodes = []
+        tools_folder_path = Path(tools_folder)
+        if tools_folder_path.is_dir():
+            tool_queries = [
+                file_path
+                for file_path in map(Path, _iter_ql_files(tools_folder_path, recursive=False))
+                if not _tool_csv_is_current(file_path, curr_db_path)
+            ]
+            if tool_queries:
+                results = _evaluate_tool_queries(
+                    curr_db_path, tools_folder_path, tool_queries, threads, codeql_bin,
+                    max_disk_cache_mb, ram_mb
                 )
-    else:
-        logger.warning("Tools folder '%s' not found. Skipping individual queries.", tools_folder)
+                decodes = [
+                    decoder.submit(decode_bqrs, output_bqrs, output_csv, codeql_bin)
+                    for output_bqrs, output_csv in results
+                ]
+        else:
+            logger.warning("Tools folder '%s' not found. Skipping individual queries.", tools_folder)
 
-    # 2) Run the entire queries folder in one go using database analyze
-    queries_folder_path = Path(queries_folder)
-    if queries_folder_path.is_dir():
-        try:
-            subprocess.run(
+        # 2) Run the entire queries folder in one go using database analyze
+        queries_folder_path = Path(queries_folder)
+        if queries_folder_path.is_dir():
+            _run_codeql(
                 [
-                    codeql_bin,
                     "database",
                     "analyze",
                     curr_db,
                     queries_folder,
                     f'--timeout={timeout}',
                     '--format=csv',
-                    f'--output={str(Path(curr_db) / "issues.csv")}',
-                    f'--threads={threads}'
+                    f'--output={curr_db_path / "issues.csv"}',
+                    f'--threads={threads}',
+                    *_ram_args(ram_mb),
+                    *_disk_cache_args(max_disk_cache_mb)
                 ],
-                check=True,
-                text=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
+                codeql_bin,
+                f"Failed to analyze database {curr_db} with queries from {queries_folder}"
             )
-        except FileNotFoundError as e:
-            raise CodeQLConfigError(
-                f"CodeQL executable not found: {codeql_bin}. "
-                "Please check your CODEQL_PATH configuration."
-            ) from e
-        except subprocess.CalledProcessError as e:
-            raise CodeQLExecutionError(
-                f"Failed to analyze database {curr_db} with queries from {queries_folder}: "
-                f"CodeQL returned exit code {e.returncode}"
-            ) from e
-    else:
-        logger.warning("Queries folder '%s' not found. Skipping database analysis.", queries_folder)
+        else:
+            logger.warning("Queries folder '%s' not found. Skipping database analysis.", queries_folder)
+
+        for decode in decodes:
+            decode.result()
+
+
+def _db_status(curr_db: str) -> Optional[Tuple[bool, bool, bool]]:
+    """
+    Inspect a database folder with a single directory scan.
+
+    Args:
+        curr_db (str): The path to the CodeQL database.
+
+    Returns:
+        Optional[Tuple[bool, bool, bool]]: Whether the folder is empty, and whether it
+            holds FunctionTree.csv and issues.csv; None if it cannot be read.
+    """
+    empty, has_function_tree, has_issues = True, False, False
+    try:
+        with os.scandir(curr_db) as entries:
+            for entry in entries:
+                empty = False
+                if entry.name == "FunctionTree.csv":
+                    has_function_tree = True
+                elif entry.name == "issues.csv":
+                    has_issues = True
+                if has_function_tree and has_issues:
+                    break
+    except OSError:
+        return None
+    return empty, has_function_tree, has_issues
+
+
+def _db_needs_queries(curr_db: str) -> bool:
+    """
+    Check whether a database still has to be queried.
+
+    Args:
+        curr_db (str): The path to the CodeQL database.
+
+    Returns:
+        bool: False if the database folder is empty or unreadable, or if its
+            FunctionTree.csv and issues.csv were already generated.
+    """
+    status = _db_status(curr_db)
+    if status is None:
+        logger.warning("Cannot access database folder '%s'. Skipping.", curr_db)
+        return False
+    empty, has_function_tree, has_issues = status
+    if empty:
+        logger.warning("Database folder '%s' is empty. Skipping queries.", curr_db)
+        return False
+
+    # If issues.csv was not generated yet, or FunctionTree.csv missing, run
+    if not has_function_tree or not has_issues:
+        return True
+
+    logger.info("Output files already exist for DB %s, skipping...", curr_db)
+    return False
+
+
+def _process_one_db(
+    curr_db: str,
+    tools_folder: str,
+    queries_folder: str,
+    threads: int,
+    codeql_bin: str,
+    timeout: int,
+    max_disk_cache_mb: Optional[int],
+    ram_mb: Optional[int]
+) -> None:
+    """
+    Run the tool and issue queries on one database (worker for the DB pool).
+
+    Args:
+        curr_db (str): The path to the CodeQL database.
+        tools_folder (str): Folder containing individual .ql files to run.
+        queries_folder (str): Folder containing .ql queries for database analysis.
+        threads (int): Number of threads to use during query execution.
+        codeql_bin (str): Full path to the 'codeql' executable.
+        timeout (int): Timeout in seconds for the 'database analyze' command.
+        max_disk_cache_mb (Optional[int]): Disk cache limit in MB, or None.
+        ram_mb (Optional[int]): Evaluator memory budget in MB, or None.
+
+    Raises:
+        CodeQLConfigError: If CodeQL executable not found.
+        CodeQLExecutionError: If query execution or database analysis fails.
+    """
+    logger.info("Processing DB: %s", curr_db)
+    run_queries_on_db(
+        curr_db, tools_folder, queries_folder, threads, codeql_bin, timeout, max_disk_cache_mb, ram_mb
+    )
 
 
 def compile_and_run_codeql_queries(
     codeql_bin: str = DEFAULT_CODEQL,
     lang: str = DEFAULT_LANG,
-    threads: int = 16,
+    threads: int = 0,
     timeout: int = 300,
     *,
-    dbs_dir: str
+    dbs_dir: str,
+    max_disk_cache_mb: Optional[int] = None
 ) -> None:
     """
     Compile and run CodeQL queries on CodeQL databases for a specific language.
 
-    1. Pre-compile all .ql files in the tools and queries folders.
-    2. Enumerate all CodeQL DBs for the given language.
-    3. Run each DB against both the 'tools' and 'issues' queries folders.
+    1. Enumerate all CodeQL DBs for the given language and keep those that lack
+       results; if there are none, return without compiling anything.
+    2. Pre-compile all .ql files in the tools and queries folders.
+    3. Run each DB that lacks results against both the 'tools' and 'issues'
+       queries folders. Databases are independent, so several run at once
+       when `threads` leaves room for more than one CodeQL run on this host;
+       the host's memory is then split between them with --ram, since each
+       evaluator would otherwise plan for all of it.
 
     Args:
         codeql_bin (str, optional): Full path to the 'codeql' executable. Defaults to DEFAULT_CODEQL.
         lang (str, optional): Language code. Defaults to 'c' (which maps to data/queries/cpp).
-        threads (int, optional): Number of threads for compilation/execution. Defaults to 16.
+        threads (int, optional): Number of threads for compilation/execution, passed to
+            CodeQL as is: 0 uses one thread per core, -N leaves N cores unused.
+            Defaults to 0.
         timeout (int, optional): Timeout in seconds for database analysis. Defaults to 300.
         dbs_dir (str): The path to the CodeQL databases.
+        max_disk_cache_mb (Optional[int], optional): Per-database evaluation cache limit
+            in MB. Defaults to None (CodeQL's default).
         
     Raises:
         CodeQLConfigError: If CodeQL executable not found (from compilation or query execution).
@@ -261,14 +583,11 @@ def compile_and_run_codeql_queries(
     """
     # Setup paths
     queries_subfolder = "cpp" if lang == "c" else lang
-    queries_folder = str(Path("data/queries") / queries_subfolder / "issues")
-    tools_folder = str(Path("data/queries") / queries_subfolder / "tools")
-
-    # Step 1: Pre-compile all queries
-    compile_all_queries(tools_folder, threads, codeql_bin)
-    compile_all_queries(queries_folder, threads, codeql_bin)
+    queries_base = Path("data/queries") / queries_subfolder
+    queries_folder = str(queries_base / "issues")
+    tools_folder = str(queries_base / "tools")
 
-    # Step 2: Run queries
+    # Step 1: Find the databases that still need queries
     # Validate database directory exists and is accessible
     dbs_folder_path = Path(dbs_dir)
     if not dbs_folder_path.exists():
@@ -280,13 +599,14 @@ def compile_and_run_codeql_queries(
         logger.warning("Database path '%s' is not a directory. No databases to process.", dbs_dir)
         return
     
-    # List what's in the folder for debugging
     try:
-        contents = list(dbs_folder_path.iterdir())
-        if len(contents) == 0:
+        if next(dbs_folder_path.iterdir(), None) is None:
             logger.warning("Database folder '%s' is empty. No databases to process.", dbs_dir)
             return
-        logger.debug("Found %d item(s) in database folder: %s", len(contents), [str(c) for c in contents])
+        # List what's in the folder for debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            contents = [str(c) for c in dbs_folder_path.iterdir()]
+            logger.debug("Found %d item(s) in database folder: %s", len(contents), contents)
     except OSError as e:
         logger.warning("Cannot access database folder '%s': %s. No databases to process.", dbs_dir, e)
         return
@@ -298,32 +618,59 @@ def compile_and_run_codeql_queries(
         logger.warning("Make sure databases were downloaded and extracted successfully.")
         return
 
-    for curr_db in actual_dbs:
-        # Check if database folder is empty
-        curr_db_path = Path(curr_db)
-        if curr_db_path.is_dir():
-            try:
-                if len(list(curr_db_path.iterdir())) == 0:
-                    logger.warning("Database folder '%s' is empty. Skipping queries.", curr_db)
-                    continue
-            except OSError:
-                logger.warning("Cannot access database folder '%s'. Skipping.", curr_db)
-                continue
-        
-        # If issues.csv was not generated yet, or FunctionTree.csv missing, run
-        if (not (curr_db_path / "FunctionTree.csv").exists() or
-                not (curr_db_path / "issues.csv").exists()):
-            logger.info("Processing DB: %s", curr_db)
-            run_queries_on_db(
-                curr_db,
-                tools_folder,
-                queries_folder,
-                threads,
-                codeql_bin,
-                timeout
-            )
+    dbs_to_run = [curr_db for curr_db in actual_dbs if _db_needs_queries(curr_db)]
+    if not dbs_to_run:
+        logger.info("All databases already have query results, nothing to run.")
+        return
+
+    # Fail fast on a missing CodeQL executable, before compiling anything
+    codeql_bin = _resolve_codeql_bin(codeql_bin)
+
+    # Step 2: Pre-compile all queries, walking their common parent folder once
+    query_folder_prefixes = (os.path.join(tools_folder, ""), os.path.join(queries_folder, ""))
+    pre_compile_qls(
+        [
+            file_path for file_path in _find_uncompiled_queries(str(queries_base))
+            if file_path.startswith(query_folder_prefixes)
+        ],
+        threads,
+        codeql_bin
+    )
+
+    # Step 3: Run queries
+    # Each CodeQL invocation already uses `threads` cores; run as many DBs side by side as fit
+    cpu_count = os.cpu_count() or 1
+    threads_per_db = threads if threads > 0 else max(1, cpu_count + threads)
+    workers = max(1, min(len(dbs_to_run), cpu_count // threads_per_db))
+    ram_mb = None
+    if workers > 1:
+        host_memory_mb = _host_memory_mb()
+        if host_memory_mb is None:
+            logger.info("Cannot determine the host's memory; running databases one at a time.")
+            workers = 1
         else:
-            logger.info("Output files already exist for this DB, skipping...")
+            ram_mb = host_memory_mb // workers
+            logger.info("Running %d databases at a time with --ram=%d each.", workers, ram_mb)
+    # Set by the first failing database, so queued ones are not started after it
+    failed = threading.Event()
+
+    def process_db(curr_db: str) -> None:
+        if failed.is_set():
+            return
+        try:
+            _process_one_db(
+                curr_db, tools_folder, queries_folder, threads, codeql_bin, timeout, max_disk_cache_mb, ram_mb
+            )
+        except BaseException:
+            failed.set()
+            raise
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(process_db, curr_db) for curr_db in dbs_to_run]
+        for future in as_completed(futures):
+            if future.exception() is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+                future.result()
 
     logger.info("✅ done!")
 
@@ -335,7 +682,7 @@ def main_cli() -> None:
     compile_and_run_codeql_queries(
         codeql_bin=DEFAULT_CODEQL,
         lang=DEFAULT_LANG,
-        threads=16,
+        threads=0,
         timeout=300,
         dbs_dir="output/databases/c"
     )
@@ -302,15 +302,15 @@ class LLMAnalyzer:
         
         Raises:
             CodeQLError: If ZIP file cannot be read or file not found in archive.
-                This exception is raised by `read_file_lines_from_zip()` and propagated here.
+                This exception is raised by `CodeQLDBLookup.extract_function_lines_from_db()`
+                and propagated here.
         """
         if not isinstance(current_function, dict):
             return str(current_function)
 
-        file_path, start_line, end_line, lines = self.db_lookup.extract_function_lines_from_db(
+        file_path, start_line, _, snippet_lines = self.db_lookup.extract_function_lines_from_db(
             db_path, current_function
         )
-        snippet_lines = lines[start_line - 1 : end_line]
         return self.db_lookup.format_numbered_snippet(file_path, start_line, snippet_lines)
 
 
@@ -39,16 +39,43 @@ def _log_exception_cause(e: Exception) -> None:
     """
     Log the cause of an exception if available and not already included in the exception message.
     Checks both e.cause (if set via constructor) and e.__cause__ (if set via 'from e').
+
+    Wrapped errors are raised as ``f"...: {e}"``, so an included cause is always
+    a suffix of the message; checking the suffix avoids searching messages that
+    can carry kilobytes of CodeQL stderr.
     """
     cause = getattr(e, 'cause', None) or getattr(e, '__cause__', None)
     if cause:
         # Only log cause if it's not already included in the exception message
-        cause_str = str(cause)
-        error_str = str(e)
-        if cause_str not in error_str:
+        if not str(e).endswith(str(cause)):
             logger.error("   Cause: %s", cause)
 
 
+def validate_configuration() -> None:
+    """
+    Validate the configuration before starting, exiting with a formatted message on failure.
+
+    Note:
+        This function does not raise exceptions. Configuration errors are logged
+        and the process exits with code 1.
+    """
+    try:
+        validate_and_exit_on_error()
+    except (CodeQLConfigError, LLMConfigError, VulnhallaError) as e:
+        # Format error message for display
+        message = f"""
+⚠️ Configuration Validation Failed
+============================================================
+{str(e)}
+============================================================
+Please fix the configuration errors above and try again.
+See README.md for configuration reference.
+"""
+        logger.error(message)
+        _log_exception_cause(e)
+        sys.exit(1)
+
+
 def step1_fetch_codeql_dbs(lang: str, threads: int, repo: str) -> str:
     """
     Step 1: Fetch CodeQL databases from GitHub.
@@ -232,21 +259,7 @@ def analyze_pipeline(repo: Optional[str] = None, lang: str = "c", threads: int =
     logger.info("=" * 60)
     
     # Validate configuration before starting
-    try:
-        validate_and_exit_on_error()
-    except (CodeQLConfigError, LLMConfigError, VulnhallaError) as e:
-        # Format error message for display
-        message = f"""
-⚠️ Configuration Validation Failed
-============================================================
-{str(e)}
-============================================================
-Please fix the configuration errors above and try again.
-See README.md for configuration reference.
-"""
-        logger.error(message)
-        _log_exception_cause(e)
-        sys.exit(1)
+    validate_configuration()
     
     # Step 1: Fetch CodeQL databases
     dbs_dir = step1_fetch_codeql_dbs(lang, threads, repo)
@@ -7,9 +7,11 @@ that are shared across multiple parts of the project.
 """
 
 from pathlib import Path
+import mmap
+import os
 import zipfile
 import yaml
-from typing import Any, Dict, List 
+from typing import Any, Dict, Iterator, List 
 
 from src.utils.exceptions import VulnhallaError, CodeQLError
 
@@ -112,6 +114,41 @@ def get_all_dbs(dbs_folder: str) -> List[str]:
         raise CodeQLError(f"OS error while accessing database folder: {dbs_folder}") from e
 
 
+def iter_matching_lines(file_name: str, needle: str) -> Iterator[str]:
+    """
+    Yield the lines of a UTF-8 text file that contain `needle`.
+
+    The file is memory-mapped and searched as bytes, so only matching lines
+    are decoded. Lines are yielded without their trailing newline.
+
+    Args:
+        file_name (str): The path to the file to search.
+        needle (str): The substring to look for.
+
+    Yields:
+        str: Each line containing `needle`, in file order.
+
+    Raises:
+        OSError: If the file cannot be opened or mapped.
+        UnicodeDecodeError: If a matching line is not valid UTF-8.
+    """
+    needle_bytes = needle.encode("utf-8")
+    with Path(file_name).open("rb") as f:
+        # mmap refuses empty files
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = mm.find(needle_bytes)
+            while pos != -1:
+                line_start = mm.rfind(b"\n", 0, pos) + 1
+                line_end = mm.find(b"\n", pos)
+                if line_end == -1:
+                    yield mm[line_start:].decode("utf-8")
+                    break
+                yield mm[line_start:line_end].decode("utf-8")
+                pos = mm.find(needle_bytes, line_end + 1)
+
+
 def read_file_lines_from_zip(zip_path: str, file_path_in_zip: str) -> str:
     """
     Read text from a single file within a ZIP archive (UTF-8).
@@ -7,6 +7,7 @@ Handles CodeQL path, GitHub token, and other non-LLM settings.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
@@ -25,7 +26,21 @@ def get_codeql_path() -> str:
     Returns:
         Path to CodeQL executable. Defaults to "codeql" if not set.
     """
-    path = os.getenv("CODEQL_PATH", "codeql")
+    return _clean_codeql_path(os.getenv("CODEQL_PATH", "codeql"))
+
+
+@lru_cache(maxsize=8)
+def _clean_codeql_path(path: str) -> str:
+    """
+    Normalize a raw CODEQL_PATH value. Memoized by the raw value, so repeated
+    lookups skip the string handling while a changed variable still takes effect.
+
+    Args:
+        path: The CODEQL_PATH value as read from the environment.
+
+    Returns:
+        The path with surrounding quotes and a raw-string prefix removed.
+    """
     # Strip quotes and Python raw string prefix if present
     if path and path != "codeql":
         path = path.strip('"').strip("'")
@@ -17,13 +17,16 @@ Analysis Pipeline Algorithm:
     6. Classify by substring: "1337" → true, "1007" → false, else → more; log stats.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path, PurePosixPath
 import csv
 import re
 import json
+import threading
 from typing import Any, Callable, Dict, List, Optional, Tuple
 from src.utils.common_functions import (
     get_all_dbs,
+    iter_matching_lines,
     read_file_lines_from_zip,
     read_file as read_file_utf8,
     write_file_ascii,
@@ -140,7 +143,7 @@ class IssueAnalyzer:
         Finds the most specific (smallest) function containing the given file and line number.
 
         Algorithm:
-            - Iterate rows where file_path substring appears
+            - Iterate rows where file_path substring appears (memory-mapped byte search)
             - Keep rows where start_line <= line <= end_line and file_path in function["file"]
             - Return function with smallest (end_line - start_line), else None
 
@@ -160,29 +163,27 @@ class IssueAnalyzer:
         smallest_range = float('inf')
 
         try:
-            with Path(function_tree_file).open("r", encoding="utf-8") as f:
-                for row in f:
-                    if file_path in row:
-                        fields = re.split(r',(?=(?:[^"]*"[^"]*")*[^"]*$)', row.strip())
-                        if len(fields) != len(keys):
-                            continue  # Skip malformed rows
-
-                        function = dict(zip(keys, fields))
-                        try:
-                            start_line = int(function["start_line"])
-                            end_line = int(function["end_line"])
-                        except ValueError:
-                            continue  # Skip if lines aren't integers
-
-                        # Check if the target line falls within this function's range
-                        if start_line <= line <= end_line:
-                            if file_path in function["file"]:
-                                # Greedy selection: track the function with smallest range
-                                # (most specific/nested function containing the line)
-                                size = end_line - start_line
-                                if size < smallest_range:
-                                    best_function = function
-                                    smallest_range = size
+            for row in iter_matching_lines(function_tree_file, file_path):
+                fields = re.split(r',(?=(?:[^"]*"[^"]*")*[^"]*$)', row.strip())
+                if len(fields) != len(keys):
+                    continue  # Skip malformed rows
+
+                function = dict(zip(keys, fields))
+                try:
+                    start_line = int(function["start_line"])
+                    end_line = int(function["end_line"])
+                except ValueError:
+                    continue  # Skip if lines aren't integers
+
+                # Check if the target line falls within this function's range
+                if start_line <= line <= end_line:
+                    if file_path in function["file"]:
+                        # Greedy selection: track the function with smallest range
+                        # (most specific/nested function containing the line)
+                        size = end_line - start_line
+                        if size < smallest_range:
+                            best_function = function
+                            smallest_range = size
         except FileNotFoundError as e:
             raise CodeQLError(f"Function tree file not found: {function_tree_file}") from e
         except PermissionError as e:
@@ -491,7 +492,7 @@ class IssueAnalyzer:
         """
         max_issue_id = 1
         results_folder = Path("output/results") / self.lang / issue_type.replace(" ", "_").replace("/", "-")
-        if not results_folder.exists() or len(list(results_folder.glob("*.json"))) == 0:
+        if not results_folder.exists() or next(results_folder.glob("*.json"), None) is None:
             return 1
             
         for file in results_folder.glob("*.json"):
@@ -638,6 +639,38 @@ class IssueAnalyzer:
         logger.info("")
 
 
+    def prewarm_db_lookups(
+        self,
+        issues_statistics: Dict[str, List[Dict[str, str]]],
+        llm_analyzer: LLMAnalyzer,
+        stop: Optional[threading.Event] = None
+    ) -> None:
+        """
+        Index the tool CSVs of the databases that are processed first, ahead of the
+        LLM querying them. Only as many databases as the lookup cache holds are
+        indexed, since any further ones would evict the first before they are used.
+        A database whose CSVs cannot be read is skipped here; the error surfaces
+        again when a lookup needs it.
+
+        Args:
+            issues_statistics (Dict[str, List[Dict[str, str]]]): Issues grouped by issue name.
+            llm_analyzer (LLMAnalyzer): The analyzer whose lookups will be served.
+            stop (Optional[threading.Event], optional): When set, no further databases
+                are indexed. Defaults to None.
+        """
+        # In the order process_issue_type() first reaches each database
+        db_paths = list(dict.fromkeys(
+            issue["db_path"] for issues in issues_statistics.values() for issue in issues
+        ))
+        for db_path in db_paths[:llm_analyzer.db_lookup.cached_db_capacity]:
+            if stop is not None and stop.is_set():
+                return
+            try:
+                llm_analyzer.db_lookup.prewarm(db_path)
+            except CodeQLError as e:
+                logger.warning("Could not index the CSV files of %s: %s", db_path, e)
+
+
     def run(self, dbs_dir: str) -> None:
         """
         Main analysis routine:
@@ -671,9 +704,18 @@ class IssueAnalyzer:
         logger.info("Total issues found: %d", total_issues)
         logger.info("")
 
-        # Process all issues, type by type
-        for issue_type in issues_statistics.keys():
-            self.process_issue_type(issue_type, issues_statistics[issue_type], llm_analyzer)
+        # Process all issues, type by type. The CSV indexes are built in the
+        # background meanwhile; the LLM requests release the GIL while they wait.
+        stop_prewarm = threading.Event()
+        prewarm_executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            prewarm_executor.submit(self.prewarm_db_lookups, issues_statistics, llm_analyzer, stop_prewarm)
+            for issue_type in issues_statistics.keys():
+                self.process_issue_type(issue_type, issues_statistics[issue_type], llm_analyzer)
+        finally:
+            stop_prewarm.set()
+            prewarm_executor.shutdown(wait=True)
+            llm_analyzer.db_lookup.close()
 
 if __name__ == '__main__':
     # Initialize logging
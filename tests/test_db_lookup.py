@@ -0,0 +1,239 @@
+"""Tests for CodeQL CSV lookups in src.codeql.db_lookup."""
+
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from src.codeql.db_lookup import CodeQLDBLookup
+from src.utils.exceptions import CodeQLError
+
+
+FUNCTION_TREE = (
+    '"function_name","file","start_line","function_id","end_line","caller_id"\n'
+    '"main","/src/app.c",10,"/src/app.c:10",40,""\n'
+    '"helper","/src/app.c",50,"/src/app.c:50",60,"/src/app.c:10"\n'
+    '"inner","/src/app.c",52,"/src/app.c:52",55,"/src/app.c:50"\n'
+    '"parse_args","/src/cli.c",5,"/src/cli.c:5",20,"/src/app.c:10"\n'
+)
+MACROS = (
+    '"macro_name","body"\n'
+    '"BUFFER_SIZE_MAX","#define BUFFER_SIZE_MAX 4096"\n'
+    '"BUFFER_SIZE","#define BUFFER_SIZE 1024"\n'
+    '"GREETING","#define GREETING ""hello, world"""\n'
+    '"MY_LIMIT","#define MY_LIMIT 1"\n'
+    '"LIMIT_MAX","#define LIMIT_MAX 2"\n'
+)
+GLOBAL_VARS = (
+    '"global_var_name","file","start_line","end_line"\n'
+    '"g_counter","/src/app.c",3,3\n'
+)
+CLASSES = (
+    '"type","name","file","start_line","end_line","simple_name"\n'
+    '"struct","ns::Config","/src/config.h",1,12,"Config"\n'
+)
+
+
+@pytest.fixture
+def db_dir(tmp_path):
+    """A fake CodeQL database folder holding the tool query CSVs."""
+    (tmp_path / "FunctionTree.csv").write_text(FUNCTION_TREE, encoding="utf-8")
+    (tmp_path / "Macros.csv").write_text(MACROS, encoding="utf-8")
+    (tmp_path / "GlobalVars.csv").write_text(GLOBAL_VARS, encoding="utf-8")
+    (tmp_path / "Classes.csv").write_text(CLASSES, encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def lookup():
+    return CodeQLDBLookup()
+
+
+def test_get_function_by_line(lookup, db_dir):
+    function = lookup.get_function_by_line(str(db_dir / "FunctionTree.csv"), "src/cli.c", 12)
+    assert function["function_name"].strip('"') == "parse_args"
+    assert lookup.get_function_by_line(str(db_dir / "FunctionTree.csv"), "src/cli.c", 30) is None
+
+
+def test_get_function_by_line_returns_innermost(lookup, db_dir):
+    function_tree_file = str(db_dir / "FunctionTree.csv")
+    assert lookup.get_function_by_line(function_tree_file, "src/app.c", 53)["function_name"].strip('"') == "inner"
+    assert lookup.get_function_by_line(function_tree_file, "src/app.c", 58)["function_name"].strip('"') == "helper"
+    assert lookup.get_function_by_line(function_tree_file, "src/app.c", 45) is None
+
+
+def test_get_function_by_name_finds_callee_of_known_function(lookup, db_dir):
+    function_tree_file = str(db_dir / "FunctionTree.csv")
+    main = lookup.get_function_by_line(function_tree_file, "src/app.c", 12)
+    function, parent = lookup.get_function_by_name(function_tree_file, "cli::parse_args", [main])
+    assert function["function_name"].strip('"') == "parse_args"
+    assert parent is main
+
+    function, parent = lookup.get_function_by_name(function_tree_file, "parse", [main])
+    assert function["function_name"].strip('"') == "parse_args"
+
+    function, parent = lookup.get_function_by_name(function_tree_file, "inner", [main])
+    assert "not found" in function and parent is None
+
+
+def test_get_macro_prefers_exact_match(lookup, db_dir):
+    macro = lookup.get_macro(str(db_dir), "BUFFER_SIZE")
+    assert "1024" in macro["body"]
+
+
+def test_get_macro_with_quoted_comma_in_body(lookup, db_dir):
+    assert lookup.get_macro(str(db_dir), "GREETING")["body"] == '#define GREETING "hello, world"'
+
+
+def test_get_macro_partial_match(lookup, db_dir):
+    macro = lookup.get_macro(str(db_dir), "SIZE_MAX")
+    assert "4096" in macro["body"]
+    assert "not found" in lookup.get_macro(str(db_dir), "MISSING")
+
+
+def test_get_macro_partial_match_prefers_prefix(lookup, db_dir):
+    assert lookup.get_macro(str(db_dir), "LIMIT")["macro_name"] == "LIMIT_MAX"
+
+
+def test_get_global_var_strips_namespace(lookup, db_dir):
+    global_var = lookup.get_global_var(str(db_dir), "app::g_counter")
+    assert global_var["global_var_name"].strip('"') == "g_counter"
+
+
+def test_get_class_by_simple_name(lookup, db_dir):
+    curr_class = lookup.get_class(str(db_dir), "Config")
+    assert curr_class["class_name"].strip('"') == "ns::Config"
+
+
+def test_get_caller_function(lookup, db_dir):
+    function_tree_file = str(db_dir / "FunctionTree.csv")
+    helper = lookup.get_function_by_line(function_tree_file, "src/app.c", 58)
+    caller = lookup.get_caller_function(function_tree_file, helper)
+    assert caller["function_name"].strip('"') == "main"
+
+
+def test_lookup_sees_regenerated_csv(lookup, db_dir):
+    assert "1024" in lookup.get_macro(str(db_dir), "BUFFER_SIZE")["body"]
+    macros_file = db_dir / "Macros.csv"
+    macros_file.write_text('"BUFFER_SIZE","#define BUFFER_SIZE 2048"\n', encoding="utf-8")
+    stat = macros_file.stat()
+    # Ensure the rewrite is visible even on filesystems with coarse timestamps
+    os.utime(macros_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert "2048" in lookup.get_macro(str(db_dir), "BUFFER_SIZE")["body"]
+
+
+def test_csv_tables_are_cached_per_lookup(lookup, db_dir, monkeypatch):
+    lookup.get_macro(str(db_dir), "BUFFER_SIZE")
+    lookup.get_global_var(str(db_dir), "g_counter")
+    assert len(lookup._csv_cache) == 2
+
+    monkeypatch.setattr("src.codeql.db_lookup._MAX_CACHED_CSV_TABLES", 1)
+    lookup.get_class(str(db_dir), "Config")
+    assert [key[0] for key in lookup._csv_cache] == [str(db_dir / "Classes.csv")]
+
+
+def test_extract_function_lines_reuses_archive(lookup, db_dir):
+    with zipfile.ZipFile(db_dir / "src.zip", "w") as zip_ref:
+        zip_ref.writestr("src/app.c", "\n".join(f"line {n}" for n in range(1, 61)))
+    function = lookup.get_function_by_line(str(db_dir / "FunctionTree.csv"), "src/app.c", 53)
+
+    file_path, start_line, end_line, snippet_lines = lookup.extract_function_lines_from_db(
+        str(db_dir), function
+    )
+    assert (file_path, start_line, end_line) == ("src/app.c", 52, 55)
+    assert snippet_lines == ["line 52", "line 53", "line 54", "line 55"]
+
+    lookup.extract_function_lines_from_db(str(db_dir), function)
+    assert lookup._read_src_file.cache_info().hits == 1
+    lookup.close()
+
+
+def test_missing_csv_raises_codeql_error(lookup, tmp_path):
+    with pytest.raises(CodeQLError, match="Macros CSV not found"):
+        lookup.get_macro(str(tmp_path), "BUFFER_SIZE")
+
+
+def test_get_macros_batch(lookup, db_dir):
+    macros = lookup.get_macros_batch(str(db_dir), ["BUFFER_SIZE", "SIZE_MAX", "MISSING", "BUFFER_SIZE"])
+    assert list(macros) == ["BUFFER_SIZE", "SIZE_MAX", "MISSING"]
+    assert "1024" in macros["BUFFER_SIZE"]["body"]
+    assert "4096" in macros["SIZE_MAX"]["body"]
+    assert macros["MISSING"] == lookup.get_macro(str(db_dir), "MISSING")
+
+
+def test_extract_function_lines_streams_large_files(lookup, db_dir, monkeypatch):
+    monkeypatch.setattr("src.codeql.db_lookup._MAX_CACHED_SRC_BYTES", 0)
+    with zipfile.ZipFile(db_dir / "src.zip", "w") as zip_ref:
+        zip_ref.writestr("src/app.c", "\r\n".join(f"line {n}" for n in range(1, 61)))
+    function = lookup.get_function_by_line(str(db_dir / "FunctionTree.csv"), "src/app.c", 53)
+
+    _, _, _, snippet_lines = lookup.extract_function_lines_from_db(str(db_dir), function)
+    assert snippet_lines == ["line 52\r", "line 53\r", "line 54\r", "line 55\r"]
+    assert lookup._read_src_file.cache_info().currsize == 0
+    lookup.close()
+
+
+def test_get_caller_function_falls_back_to_enclosing_function(lookup, db_dir):
+    function_tree_file = str(db_dir / "FunctionTree.csv")
+    assert lookup.get_caller_function(function_tree_file, {"caller_id": '"/src/app.c:53"'})["function_name"] == "inner"
+    assert "not found" in lookup.get_caller_function(function_tree_file, {"caller_id": '"external"'})
+    assert "not found" in lookup.get_caller_function(function_tree_file, {"caller_id": '"/src/app.c:end"'})
+
+
+def test_prewarm_indexes_all_tool_csvs(lookup, db_dir):
+    lookup.prewarm(str(db_dir))
+    assert sorted(Path(key[0]).name for key in lookup._csv_cache) == [
+        "Classes.csv", "FunctionTree.csv", "GlobalVars.csv", "Macros.csv"
+    ]
+
+
+def test_get_macro_with_oversized_body(lookup, db_dir):
+    body = "#define HUGE_TABLE " + "0x00, " * 40_000
+    with (db_dir / "Macros.csv").open("a", encoding="utf-8") as f:
+        f.write(f'"HUGE_TABLE","{body}"\n')
+    assert lookup.get_macro(str(db_dir), "HUGE_TABLE")["body"] == body.strip()
+
+
+def test_undecodable_csv_raises_codeql_error(lookup, db_dir):
+    (db_dir / "Macros.csv").write_bytes(b'"BAD","\xff\xfe"\n')
+    with pytest.raises(CodeQLError, match="Failed to decode Macros CSV"):
+        lookup.get_macro(str(db_dir), "BAD")
+
+
+def test_prewarm_db_lookups_stops_at_cache_capacity(lookup, tmp_path, monkeypatch):
+    from types import SimpleNamespace
+    from src.vulnhalla import IssueAnalyzer
+
+    monkeypatch.setattr("src.codeql.db_lookup._MAX_CACHED_CSV_TABLES", 8)
+    db_paths = []
+    for name in ("db1", "db2", "db3"):
+        db = tmp_path / name
+        db.mkdir()
+        for csv_name, content in (
+            ("FunctionTree.csv", FUNCTION_TREE), ("Macros.csv", MACROS),
+            ("GlobalVars.csv", GLOBAL_VARS), ("Classes.csv", CLASSES),
+        ):
+            (db / csv_name).write_text(content, encoding="utf-8")
+        db_paths.append(str(db))
+    issues_statistics = {
+        "type A": [{"db_path": db_paths[1]}, {"db_path": db_paths[0]}],
+        "type B": [{"db_path": db_paths[2]}, {"db_path": db_paths[1]}],
+    }
+
+    IssueAnalyzer().prewarm_db_lookups(issues_statistics, SimpleNamespace(db_lookup=lookup))
+    assert {Path(key[0]).parent.name for key in lookup._csv_cache} == {"db2", "db1"}
+    assert len(lookup._csv_cache) == 8
+
+
+def test_prewarm_db_lookups_honours_stop(lookup, db_dir):
+    import threading
+    from types import SimpleNamespace
+    from src.vulnhalla import IssueAnalyzer
+
+    stop = threading.Event()
+    stop.set()
+    IssueAnalyzer().prewarm_db_lookups(
+        {"type A": [{"db_path": str(db_dir)}]}, SimpleNamespace(db_lookup=lookup), stop
+    )
+    assert len(lookup._csv_cache) == 0
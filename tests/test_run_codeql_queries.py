@@ -0,0 +1,192 @@
+"""Tests for src.codeql.run_codeql_queries, driven by a stub 'codeql' executable on PATH."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.codeql.run_codeql_queries import compile_and_run_codeql_queries
+from src.utils.exceptions import CodeQLConfigError, CodeQLExecutionError
+
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="the stub codeql relies on a shebang line")
+
+TOOL_QUERIES = ("Classes", "FunctionTree", "GlobalVars", "Macros")
+
+# Mimics the files the CodeQL CLI writes for the subcommands the pipeline uses.
+# Every call is appended to $STUB_CODEQL_LOG; $STUB_CODEQL_FAIL names a
+# subcommand that should fail with a message on stderr, after writing part
+# of its --output as an interrupted command would.
+STUB_CODEQL = '''
+import os
+import sys
+from pathlib import Path
+
+args = sys.argv[1:]
+with open(os.environ["STUB_CODEQL_LOG"], "a", encoding="utf-8") as log:
+    log.write("\\t".join(args) + "\\n")
+positional = [arg for arg in args[2:] if not arg.startswith("--")]
+options = dict(arg[2:].partition("=")[::2] for arg in args if arg.startswith("--"))
+if args[1] == os.environ.get("STUB_CODEQL_FAIL"):
+    if "output" in options:
+        Path(options["output"]).write_text("truncat", encoding="utf-8")
+    sys.stderr.write(f"A fatal error occurred: {args[1]} went wrong\\n")
+    sys.exit(2)
+
+if args[:2] == ["query", "compile"]:
+    for query in positional:
+        Path(query + "x").write_text("compiled", encoding="utf-8")
+elif args[:2] == ["database", "run-queries"]:
+    db, queries = Path(positional[0]), [Path(query) for query in positional[1:]]
+    for query in queries:
+        pack = (query.parent / "qlpack.yml").read_text(encoding="utf-8").split()[1]
+        bqrs = db / "results" / pack / query.with_suffix(".bqrs").name
+        bqrs.parent.mkdir(parents=True, exist_ok=True)
+        bqrs.write_text(f"new {query.stem} rows\\n", encoding="utf-8")
+elif args[:2] == ["bqrs", "decode"]:
+    Path(options["output"]).write_text(Path(positional[0]).read_text(encoding="utf-8"), encoding="utf-8")
+elif args[:2] == ["database", "analyze"]:
+    Path(options["output"]).write_text('"issue"\\n', encoding="utf-8")
+'''
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """A working directory with a query tree and a stub 'codeql' first on PATH."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    codeql = bin_dir / "codeql"
+    codeql.write_text(f"#!{sys.executable}\n{STUB_CODEQL}", encoding="utf-8")
+    codeql.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setenv("STUB_CODEQL_LOG", str(tmp_path / "codeql.log"))
+    monkeypatch.delenv("STUB_CODEQL_FAIL", raising=False)
+
+    work = tmp_path / "work"
+    tools = work / "data" / "queries" / "cpp" / "tools"
+    issues = work / "data" / "queries" / "cpp" / "issues"
+    tools.mkdir(parents=True)
+    issues.mkdir(parents=True)
+    (tools / "qlpack.yml").write_text("name: stub-tools\nversion: 0.0.0\n", encoding="utf-8")
+    for name in TOOL_QUERIES:
+        (tools / f"{name}.ql").write_text("select 1", encoding="utf-8")
+    (issues / "Overflow.ql").write_text("select 1", encoding="utf-8")
+    monkeypatch.chdir(work)
+    return tmp_path
+
+
+def make_db(workspace: Path, name: str) -> Path:
+    db = workspace / "work" / "dbs" / name
+    db.mkdir(parents=True)
+    (db / "codeql-database.yml").write_text("sourceLocationPrefix: /src\n", encoding="utf-8")
+    return db
+
+
+def codeql_calls(workspace: Path):
+    log = workspace / "codeql.log"
+    if not log.exists():
+        return []
+    return [line.split("\t") for line in log.read_text(encoding="utf-8").splitlines()]
+
+
+def run(workspace: Path):
+    compile_and_run_codeql_queries("codeql", "c", threads=1, dbs_dir=str(workspace / "work" / "dbs"))
+
+
+def test_tool_results_are_decoded_next_to_the_database(workspace):
+    db = make_db(workspace, "repo")
+    run(workspace)
+
+    for name in TOOL_QUERIES:
+        assert (db / f"{name}.csv").read_text(encoding="utf-8") == f"new {name} rows\n"
+    assert (db / "issues.csv").exists()
+    assert not list(db.glob("*.partial"))
+    assert Path("data/queries/cpp/issues/Overflow.qlx").exists()
+
+    run_queries = [call for call in codeql_calls(workspace) if call[:2] == ["database", "run-queries"]]
+    assert len(run_queries) == 1 and "--rerun" in run_queries[0]
+
+
+def test_current_tool_csvs_are_not_regenerated(workspace):
+    db = make_db(workspace, "repo")
+    tools = Path("data/queries/cpp/tools")
+    (db / "Macros.csv").write_text("current macros\n", encoding="utf-8")
+    (db / "Classes.csv").write_text("stale classes\n", encoding="utf-8")
+    query_mtime = (tools / "Macros.ql").stat().st_mtime
+    os.utime(db / "Macros.csv", (query_mtime + 10, query_mtime + 10))
+    os.utime(db / "Classes.csv", (query_mtime - 10, query_mtime - 10))
+    run(workspace)
+
+    assert (db / "Macros.csv").read_text(encoding="utf-8") == "current macros\n"
+    assert (db / "Classes.csv").read_text(encoding="utf-8") == "new Classes rows\n"
+    run_queries = next(call for call in codeql_calls(workspace) if call[:2] == ["database", "run-queries"])
+    assert str(tools / "Macros.ql") not in run_queries
+
+
+def test_databases_with_results_are_skipped(workspace):
+    db = make_db(workspace, "repo")
+    (db / "FunctionTree.csv").write_text("done\n", encoding="utf-8")
+    (db / "issues.csv").write_text("done\n", encoding="utf-8")
+    run(workspace)
+    assert codeql_calls(workspace) == []
+
+
+def test_concurrent_databases_split_host_memory(workspace, monkeypatch):
+    make_db(workspace, "one")
+    make_db(workspace, "two")
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    monkeypatch.setattr("src.codeql.run_codeql_queries._host_memory_mb", lambda: 8000)
+    run(workspace)
+
+    evaluations = [call for call in codeql_calls(workspace) if call[0] == "database"]
+    assert len(evaluations) == 4
+    assert all("--ram=4000" in call for call in evaluations)
+
+
+def test_failed_analysis_raises_with_stderr(workspace, monkeypatch):
+    make_db(workspace, "repo")
+    monkeypatch.setenv("STUB_CODEQL_FAIL", "analyze")
+    with pytest.raises(CodeQLExecutionError, match="analyze went wrong"):
+        run(workspace)
+
+
+def test_failed_decode_leaves_no_tool_csv(workspace, monkeypatch):
+    db = make_db(workspace, "repo")
+    monkeypatch.setenv("STUB_CODEQL_FAIL", "decode")
+    with pytest.raises(CodeQLExecutionError, match="Failed to decode BQRS file"):
+        run(workspace)
+    assert sorted(path.name for path in db.glob("*.csv*")) == ["issues.csv"]
+
+
+def test_missing_codeql_raises_config_error(workspace, monkeypatch):
+    make_db(workspace, "repo")
+    monkeypatch.setenv("PATH", str(workspace / "empty"))
+    with pytest.raises(CodeQLConfigError, match="CodeQL executable not found"):
+        run(workspace)
+
+
+def test_failed_database_stops_the_remaining_ones(workspace, monkeypatch):
+    for name in ("one", "two", "three"):
+        make_db(workspace, name)
+    monkeypatch.setattr(os, "cpu_count", lambda: 1)
+    monkeypatch.setenv("STUB_CODEQL_FAIL", "analyze")
+    with pytest.raises(CodeQLExecutionError, match="analyze went wrong"):
+        run(workspace)
+
+    analyzed = [call for call in codeql_calls(workspace) if call[:2] == ["database", "analyze"]]
+    assert len(analyzed) == 1
+
+
+def test_undecodable_stderr_is_replaced(workspace, monkeypatch):
+    make_db(workspace, "repo")
+    codeql = workspace / "bin" / "codeql"
+    codeql.write_text(
+        codeql.read_text(encoding="utf-8").replace(
+            "args = sys.argv[1:]", "sys.stderr.buffer.write(b'progress \\xff\\n')\nargs = sys.argv[1:]"
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("STUB_CODEQL_FAIL", "analyze")
+    with pytest.raises(CodeQLExecutionError, match="progress �"):
+        run(workspace)